@@ -0,0 +1,91 @@
+"""
+Memory benchmark of the in-memory job storage.
+
+Compares the per-job overhead of keeping completed ingest jobs as pydantic `JobStatus` instances holding the full graph dump (before)
+with the slotted `JobRecord` keeping a summary and the compressed dump (after).
+
+    uv run python -m benchmarks.job_memory
+"""
+
+import copy
+import gc
+import time
+import tracemalloc
+from uuid import uuid4
+
+from knwl_api.models.JobRecord import JobRecord
+from knwl_api.models.JobStatus import JobState, JobStatus
+
+JOB_COUNT = 1000
+NODES_PER_GRAPH = 40
+EDGES_PER_GRAPH = 60
+
+
+def ingest_result(index: int) -> dict:
+    """A synthetic graph dump of the size a short document typically yields."""
+    nodes = [{
+        "name": f"Entity {index}-{i}",
+        "type": "Person",
+        "type_name": "KnwlNode",
+        "id": f"node|>{uuid4().hex}",
+        "description": f"Entity {i} of document {index}, described the way an LLM extraction typically does. " * 3,
+        "chunk_ids": [f"chunk|>{uuid4().hex}"],
+        "degree": None,
+        "keywords": ["physics", "vienna"],
+        "index": i,
+        "data": {},
+    } for i in range(NODES_PER_GRAPH)]
+    edges = [{
+        "degree": None,
+        "source_id": nodes[i % NODES_PER_GRAPH]["id"],
+        "target_id": nodes[(i + 1) % NODES_PER_GRAPH]["id"],
+        "source_name": None,
+        "target_name": None,
+        "type": "related_to",
+        "type_name": "KnwlEdge",
+        "id": f"edge|>{uuid4().hex}",
+        "chunk_ids": [f"chunk|>{uuid4().hex}"],
+        "keywords": ["colleague"],
+        "description": f"Relation {i} of document {index} as extracted from the text. " * 2,
+        "weight": 1.0,
+        "index": i,
+        "data": {},
+    } for i in range(EDGES_PER_GRAPH)]
+    return {"nodes": nodes, "edges": edges, "keywords": ["physics"], "type_name": "KnwlGraph", "id": f"graph|>{uuid4().hex}"}
+
+
+def measure(create) -> float:
+    """Returns the bytes allocated per job when creating `JOB_COUNT` jobs."""
+    results = [ingest_result(i) for i in range(JOB_COUNT)]
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    jobs = {}
+    for result in results:
+        job_id = str(uuid4())
+        # every job owns its result, the results list is not counted
+        jobs[job_id] = create(job_id, copy.deepcopy(result))
+    del results
+    gc.collect()
+    allocated = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    return allocated / JOB_COUNT
+
+
+def before(job_id: str, result: dict):
+    return JobStatus(job_id=job_id, job_type="ingest", state=JobState.COMPLETED, result=result, created_at=time.time(), updated_at=time.time())
+
+
+def after(job_id: str, result: dict):
+    record = JobRecord(job_id=job_id, job_type="ingest", state=JobState.COMPLETED, created_at=time.time(), updated_at=time.time())
+    record.set_result(result)
+    return record
+
+
+if __name__ == "__main__":
+    bytes_before = measure(before)
+    bytes_after = measure(after)
+    print(f"{JOB_COUNT} completed ingest jobs, {NODES_PER_GRAPH} nodes and {EDGES_PER_GRAPH} edges per graph")
+    print(f"JobStatus with full result:    {bytes_before / 1024:8.1f} KiB per job")
+    print(f"JobRecord with summary + zlib: {bytes_after / 1024:8.1f} KiB per job")
+    print(f"reduction:                     {bytes_before / bytes_after:8.1f}x")
@@ -0,0 +1,130 @@
+"""
+Admission control for the API routes.
+
+Every route gets its own concurrency limit which adapts to the observed latency (AIMD):
+the limit grows by roughly one per round trip while the route is busy and responds within its latency target,
+and is cut multiplicatively (once per congestion window) when a response is slow or fails. Requests beyond the limit are rejected immediately
+with a 503 rather than queued on the event loop, so a slow LLM provider cannot starve the cheap routes.
+The MCP tools asking questions or augmenting text share the limits of the equivalent routes.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import HTTPException, Request
+
+
+@dataclass(frozen=True)
+class LimitSettings:
+    initial: float = 20
+    min_limit: float = 1
+    max_limit: float = 200
+    target_latency: float = 1.0  # seconds
+    backoff: float = 0.75
+
+
+# the LLM-bound routes are slow by nature, start them low and allow for long answers
+DEFAULT_SETTINGS = LimitSettings()
+ROUTE_SETTINGS = {
+    "/kg/ask": LimitSettings(initial=8, max_limit=64, target_latency=30.0),
+    "/kg/augment": LimitSettings(initial=8, max_limit=64, target_latency=20.0),
+}
+
+# the stats route is never limited, the health and info routes live outside the limited routers
+EXEMPT_ROUTES = {"/kg/admission"}
+
+
+class AdaptiveLimit:
+    """AIMD concurrency limit of a single route."""
+
+    def __init__(self, settings: LimitSettings = DEFAULT_SETTINGS):
+        self.settings = settings
+        self.limit = float(settings.initial)
+        self.in_flight = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.latency = 0.0  # exponential moving average, in seconds
+        self.last_cut = 0  # ticket of the last request admitted before the last backoff
+
+    def try_acquire(self) -> int | None:
+        """Returns the ticket of the admitted request, or None if the request is rejected."""
+        if self.in_flight >= int(self.limit):
+            self.rejected += 1
+            return None
+        self.in_flight += 1
+        self.admitted += 1
+        return self.admitted
+
+    def release(self, ticket: int, latency: float, failed: bool = False) -> None:
+        busy = self.in_flight >= self.limit / 2
+        self.in_flight -= 1
+        self.latency = latency if self.latency == 0 else 0.9 * self.latency + 0.1 * latency
+        if failed or latency > self.settings.target_latency:
+            # back off once per congestion window, the requests admitted before the last cut do not cut again
+            if ticket > self.last_cut:
+                self.limit = max(self.settings.min_limit, self.limit * self.settings.backoff)
+                self.last_cut = self.admitted
+        elif busy:
+            # only grow when the limit is actually in use, an idle route keeps its limit
+            self.limit = min(self.settings.max_limit, self.limit + 1 / self.limit)
+
+    def to_dict(self) -> dict:
+        return {
+            "limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "latency": round(self.latency, 4),
+            "target_latency": self.settings.target_latency,
+        }
+
+
+class AdmissionControl:
+    """Keeps the adaptive limits per route."""
+
+    def __init__(self, route_settings: Optional[dict[str, LimitSettings]] = None, exempt: Optional[set[str]] = None):
+        self.route_settings = ROUTE_SETTINGS if route_settings is None else route_settings
+        self.exempt = EXEMPT_ROUTES if exempt is None else exempt
+        self.limits: dict[str, AdaptiveLimit] = {}
+
+    def get_limit(self, route: str) -> AdaptiveLimit:
+        found = self.limits.get(route)
+        if found is None:
+            found = self.limits[route] = AdaptiveLimit(self.route_settings.get(route, DEFAULT_SETTINGS))
+        return found
+
+    def stats(self) -> dict:
+        return {route: limit.to_dict() for route, limit in sorted(self.limits.items())}
+
+    def dependency(self, prefix: str = ""):
+        """
+        Returns a router dependency applying the admission control to every route of the router.
+        The prefix is the one the router is included with, the limits are kept per full route path.
+        """
+
+        async def admit(request: Request):
+            route = request.scope["route"].path
+            if not route.startswith(prefix):
+                route = prefix + route
+            if route in self.exempt:
+                yield
+                return
+            limit = self.get_limit(route)
+            ticket = limit.try_acquire()
+            if ticket is None:
+                raise HTTPException(status_code=503, detail=f"Too many concurrent requests on {route}, try again later.", headers={"Retry-After": "1"})
+            failed = False
+            started = time.perf_counter()
+            try:
+                yield
+            except Exception as e:
+                failed = not isinstance(e, HTTPException) or e.status_code >= 500
+                raise
+            finally:
+                limit.release(ticket, time.perf_counter() - started, failed=failed)
+
+        return admit
+
+
+admission = AdmissionControl()
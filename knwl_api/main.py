@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from importlib.metadata import version
 
 from fastapi import FastAPI
@@ -9,7 +10,16 @@ knwl_version = version("knwl")
 
 from knwl_api.routes import register_routes
 from knwl_api.mcp_server import mcp_app
- 
+from knwl_api.routes.kg import service
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    async with mcp_app.lifespan(app):
+        # the background workers live on the loop serving the requests
+        await service.start_workers()
+        yield
+
 
 # @formatter:off
 app = FastAPI(
@@ -20,7 +30,7 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/api/openapi.json",
-    lifespan=mcp_app.lifespan,  # CRITICAL: Pass MCP's lifespan to FastAPI
+    lifespan=lifespan,  # CRITICAL: wraps MCP's lifespan, which FastAPI needs
 )
 
 
@@ -34,6 +44,7 @@ app.add_middleware(
         "X-qa-Id",  # custom header for QA ID
         "X-service-name",  # custom header for AZ service name
         "X-from-cache",  # when using load testing
+        "X-Next-Cursor",  # cursor of the next page of the node/edge listings
     ],
 )
 # app.add_middleware(BaseHTTPMiddleware, dispatch=authentication_middleware)
@@ -6,10 +6,13 @@ for the Knwl knowledge graph operations using FastMCP.
 """
 
 import asyncio
-from typing import Optional
+import time
+from typing import Awaitable, Callable, Optional
 from fastmcp import FastMCP
 
 from knwl import KnwlInput, KnwlParams
+from knwl_api.admission import admission
+from knwl_api.models.JobStatus import JobState
 from knwl_api.routes.kg import service
 
 
@@ -18,6 +21,30 @@ mcp = FastMCP("API Tools")
 
 # Get the MCP app before creating FastAPI app
 mcp_app = mcp.http_app()
+
+
+async def admit(route: str, call: Callable[[], Awaitable[dict]]) -> dict:
+    """
+    Runs the call within the admission limit of the equivalent API route, so the LLM-bound tools share the limit with the API.
+    A rejected call returns an error rather than waiting.
+    """
+    limit = admission.get_limit(route)
+    ticket = limit.try_acquire()
+    if ticket is None:
+        return {
+            "error": f"Too many concurrent requests on {route}, try again later."
+        }
+    failed = False
+    started = time.perf_counter()
+    try:
+        return await call()
+    except Exception:
+        failed = True
+        raise
+    finally:
+        limit.release(ticket, time.perf_counter() - started, failed=failed)
+
+
 # ============================================================================================
 # Resources
 # ============================================================================================
@@ -79,6 +106,85 @@ async def get_node(node_id: str) -> dict:
     return await service.get_node_by_id(node_id)
 
 
+@mcp.tool()
+async def get_neighborhood(
+    node_id: str,
+    depth: int = 1,
+    limit: int = 50,
+    fan_out: int = 25
+) -> dict:
+    """
+    Retrieve the subgraph around a node in one call, e.g. everything connected to a person within 2 hops.
+
+    Args:
+        node_id: The unique identifier of the node at the center
+        depth: The maximum amount of hops from the node (at most 3)
+        limit: The maximum amount of nodes to return
+        fan_out: The maximum amount of new neighbors expanded per node
+
+    Returns:
+        The nodes and edges of the neighborhood and whether the traversal was truncated
+    """
+    neighborhood = await service.get_neighborhood(node_id, depth, limit, fan_out)
+    if neighborhood is None:
+        return {
+            "error": f"Node {node_id} not found"
+        }
+    return neighborhood.model_dump()
+
+
+@mcp.tool()
+async def list_nodes(
+    node_type: Optional[str] = None,
+    name_prefix: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = 50
+) -> dict:
+    """
+    List the nodes of the knowledge graph, one page at a time.
+
+    Args:
+        node_type: Optional type the nodes should have
+        name_prefix: Optional (case-insensitive) prefix of the node names
+        cursor: The cursor returned by the previous call, omit for the first page
+        limit: The maximum amount of nodes to return
+
+    Returns:
+        The nodes and the cursor of the next page (None if this is the last page)
+    """
+    ids, next_cursor = await service.list_node_ids(node_type, name_prefix, cursor, limit)
+    return {
+        "nodes": [node.model_dump() async for node in service.iter_nodes(ids)],
+        "next_cursor": next_cursor
+    }
+
+
+@mcp.tool()
+async def list_edges(
+    edge_type: Optional[str] = None,
+    name_prefix: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = 50
+) -> dict:
+    """
+    List the edges of the knowledge graph, one page at a time.
+
+    Args:
+        edge_type: Optional type the edges should have
+        name_prefix: Optional (case-insensitive) prefix of the source node names
+        cursor: The cursor returned by the previous call, omit for the first page
+        limit: The maximum amount of edges to return
+
+    Returns:
+        The edges and the cursor of the next page (None if this is the last page)
+    """
+    ids, next_cursor = await service.list_edge_ids(edge_type, name_prefix, cursor, limit)
+    return {
+        "edges": [edge.model_dump() async for edge in service.iter_edges(ids)],
+        "next_cursor": next_cursor
+    }
+
+
 @mcp.tool()
 async def delete_node(node_id: str) -> dict:
     """
@@ -178,6 +284,29 @@ async def get_job_status(job_id: str) -> dict:
     return status.model_dump()
 
 
+@mcp.tool()
+async def get_job_result(job_id: str) -> dict:
+    """
+    Get the full result of a completed job, the job status only holds a summary of ingested graphs.
+
+    Args:
+        job_id: The unique identifier of the job
+
+    Returns:
+        The full job result (e.g. the ingested graph)
+    """
+    record = await service.get_job(job_id)
+    if record is None:
+        return {
+            "error": f"Job {job_id} not found"
+        }
+    if record.state != JobState.COMPLETED:
+        return {
+            "error": f"Job {job_id} is {record.state.value}"
+        }
+    return record.get_result()
+
+
 @mcp.tool()
 async def ask_question(
     question: str,
@@ -191,10 +320,13 @@ async def ask_question(
         strategy: Optional strategy for answering (e.g., 'default', 'precise', 'comprehensive')
 
     Returns:
-        The answer from the knowledge graph
+        The answer from the knowledge graph, or an error if too many questions are being answered
     """
-    answer = await service.ask_question(question, strategy)
-    return answer.model_dump()
+    async def ask() -> dict:
+        answer = await service.ask_question(question, strategy)
+        return answer.model_dump()
+
+    return await admit("/kg/ask", ask)
 
 
 @mcp.tool()
@@ -211,7 +343,10 @@ async def augment_text(
         strategy: Optional strategy for augmentation (e.g., 'default', 'precise', 'comprehensive')
 
     Returns:
-        The augmented context from the knowledge graph
+        The augmented context from the knowledge graph, or an error if too many augmentations are running
     """
-    context = await service.augment(text, strategy)
-    return context.model_dump()
+    async def augment() -> dict:
+        context = await service.augment(text, strategy)
+        return context.model_dump()
+
+    return await admit("/kg/augment", augment)
@@ -0,0 +1,56 @@
+import json
+import zlib
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from knwl_api.models.JobStatus import JobState, JobStatus
+
+
+def summarize_result(result: Any) -> Any:
+    """
+    Returns the summary of a job result kept in the job status.
+    Graphs are reduced to their Id, the node/edge counts and Ids (and the ingest stages if present), anything else is kept as-is.
+    """
+    if isinstance(result, dict) and isinstance(result.get("nodes"), list) and isinstance(result.get("edges"), list):
+        summary = {
+            "id": result.get("id"),
+            "node_count": len(result["nodes"]),
+            "edge_count": len(result["edges"]),
+            "node_ids": [n.get("id") for n in result["nodes"]],
+            "edge_ids": [e.get("id") for e in result["edges"]],
+        }
+        if "stages" in result:
+            summary["stages"] = result["stages"]
+        return summary
+    return result
+
+
+@dataclass(slots=True)
+class JobRecord:
+    """
+    Compact in-memory record of a job.
+    A summarized result is stored next to the zlib-compressed JSON of the full result, which is only decoded on request.
+    """
+
+    job_id: str
+    job_type: str
+    state: JobState
+    created_at: float
+    updated_at: float
+    summary: Any = None
+    payload: Optional[bytes] = None
+    error: Optional[str] = None
+
+    def set_result(self, result: Any) -> None:
+        self.summary = summarize_result(result)
+        if self.summary is not result:
+            self.payload = zlib.compress(json.dumps(result, default=str).encode("utf-8"))
+
+    def get_result(self) -> Any:
+        """Returns the full result of the job."""
+        if self.payload is None:
+            return self.summary
+        return json.loads(zlib.decompress(self.payload))
+
+    def to_status(self) -> JobStatus:
+        return JobStatus(job_id=self.job_id, job_type=self.job_type, state=self.state, result=self.summary, error=self.error, created_at=self.created_at, updated_at=self.updated_at)
@@ -14,7 +14,7 @@ class JobStatus(BaseModel):
     job_id: str = Field(description="Unique job identifier")
     job_type:str = Field(description="Type of the job")
     state: JobState = Field(description="Current state of the job")
-    result: Optional[Any] = Field(default=None, description="Job result if completed")
+    result: Optional[Any] = Field(default=None, description="Job result if completed, graphs are summarized to their counts and Ids")
     error: Optional[str] = Field(default=None, description="Error message if failed")
     created_at: float = Field(description="Timestamp when job was created")
     updated_at: float = Field(description="Timestamp when job was last updated")
@@ -0,0 +1,11 @@
+from knwl.models.KnwlEdge import KnwlEdge
+from knwl.models.KnwlNode import KnwlNode
+from pydantic import BaseModel, Field
+
+
+class KnwlNeighborhood(BaseModel):
+    root_id: str = Field(description="Id of the node the neighborhood is centered on.")
+    depth: int = Field(description="Maximum amount of hops from the root.")
+    nodes: list[KnwlNode] = Field(default_factory=list, description="Nodes within the neighborhood, the root first.")
+    edges: list[KnwlEdge] = Field(default_factory=list, description="Edges between the nodes of the neighborhood.")
+    truncated: bool = Field(default=False, description="Whether the traversal stopped early because a fan-out cap or budget was reached.")
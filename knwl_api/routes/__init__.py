@@ -3,5 +3,13 @@ from fastapi import FastAPI
 from .kg import register_kg_routes
 
 
+async def health():
+    """
+    Health endpoint, not subject to admission control.
+    """
+    return {"status": "ok"}
+
+
 def register_routes(app: "FastAPI") -> None:
     register_kg_routes(app)
+    app.add_api_route("/health", health, methods=["GET"], tags=["Info"])
@@ -1,6 +1,10 @@
 
 
 def register_kg_routes(app):
+    from fastapi import Depends
+
+    from knwl_api.admission import admission
     from .controller import router as app_router
 
-    app.include_router(app_router, prefix=f"/kg", tags=["kg"])
+    # per-route adaptive concurrency limits, see /kg/admission
+    app.include_router(app_router, prefix=f"/kg", tags=["kg"], dependencies=[Depends(admission.dependency("/kg"))])
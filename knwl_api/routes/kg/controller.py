@@ -1,13 +1,25 @@
-from fastapi import APIRouter, HTTPException
+from typing import AsyncIterator, Optional
+
+from fastapi import APIRouter, HTTPException, Query
 from fastapi import Request
+from fastapi.responses import StreamingResponse
 from knwl import KnwlParams, KnwlAnswer, KnwlContext
+from pydantic import BaseModel, ValidationError
 
-from knwl_api.models.JobStatus import JobStatus, JobResponse
+from knwl_api.admission import admission
+from knwl_api.models.JobStatus import JobState, JobStatus, JobResponse
+from knwl_api.models.KnwlFact import KnwlFact
+from knwl_api.models.KnwlNeighborhood import KnwlNeighborhood
 from knwl_api.routes.kg import service
 
 router = APIRouter()
 
 
+async def to_ndjson(items: AsyncIterator[BaseModel]) -> AsyncIterator[str]:
+    async for item in items:
+        yield item.model_dump_json() + "\n"
+
+
 @router.get("/node_count", description="Returns the amount of nodes.")
 async def get_node_count(request: Request):
     try:
@@ -32,6 +44,11 @@ async def get_namespace(request: Request):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/admission", description="Returns the current concurrency limit and the admission counts per route.")
+async def get_admission_stats():
+    return admission.stats()
+
+
 @router.get("/node/{id}", description="Retrieves a node by its Id.")
 async def get_node_by_id(id: str):
     try:
@@ -41,6 +58,43 @@ async def get_node_by_id(id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/node/{id}/neighborhood", description="Retrieves the subgraph within the given amount of hops of a node.", response_model=KnwlNeighborhood)
+async def get_neighborhood(id: str, depth: int = Query(default=1, ge=0, le=service.MAX_NEIGHBORHOOD_DEPTH), limit: int = Query(default=50, ge=1, le=service.MAX_NEIGHBORHOOD_SIZE), fan_out: int = Query(default=25, ge=1)):
+    try:
+        neighborhood = await service.get_neighborhood(id, depth, limit, fan_out)
+        if neighborhood is None:
+            raise HTTPException(status_code=404, detail=f"Node {id} not found")
+        return neighborhood
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/nodes", description="Streams the nodes as NDJSON, the cursor of the next page is in the 'X-Next-Cursor' header.")
+async def list_nodes(type: Optional[str] = None, name_prefix: Optional[str] = None, cursor: Optional[str] = None, limit: int = Query(default=100, ge=1, le=service.MAX_PAGE_SIZE)):
+    try:
+        ids, next_cursor = await service.list_node_ids(type, name_prefix, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return StreamingResponse(to_ndjson(service.iter_nodes(ids)), media_type="application/x-ndjson", headers=headers)
+
+
+@router.get("/edges", description="Streams the edges as NDJSON, the cursor of the next page is in the 'X-Next-Cursor' header. The name prefix applies to the source node.")
+async def list_edges(type: Optional[str] = None, name_prefix: Optional[str] = None, cursor: Optional[str] = None, limit: int = Query(default=100, ge=1, le=service.MAX_PAGE_SIZE)):
+    try:
+        ids, next_cursor = await service.list_edge_ids(type, name_prefix, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return StreamingResponse(to_ndjson(service.iter_edges(ids)), media_type="application/x-ndjson", headers=headers)
+
+
 @router.delete("/node/{id}", description="Deletes a node by its Id.")
 async def delete_node_by_id(id: str):
     try:
@@ -80,6 +134,22 @@ async def get_job_status(job_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/job/{job_id}/result", description="Get the full result of a completed job.")
+async def get_job_result(job_id: str):
+    try:
+        record = await service.get_job(job_id)
+        if record is None:
+            raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+        if record.state != JobState.COMPLETED:
+            raise HTTPException(status_code=409, detail=f"Job {job_id} is {record.state.value}")
+
+        return record.get_result()
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/fact", description="Adds a fact to the knowledge graph.", response_model=JobResponse)
 async def add_fact(request: Request):
     """
@@ -102,6 +172,34 @@ async def add_fact(request: Request):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/facts", description="Adds facts in bulk to the knowledge graph.", response_model=list[JobResponse])
+async def add_facts(request: Request):
+    """
+    Adds facts to the knowledge graph, every fact gets its own job.
+    Expects a JSON array of objects with 'name', 'content', and 'type' fields.
+    The facts are written together, so all jobs complete (or fail) at the same time.
+    """
+    try:
+        data = await request.json()
+        if not isinstance(data, list):
+            raise HTTPException(status_code=400, detail="Expected an array of facts in request body.")
+        for i, fact in enumerate(data):
+            for field in ["name", "content", "type"]:
+                if not isinstance(fact, dict) or not field in fact:
+                    raise HTTPException(status_code=400, detail=f"Missing '{field}' of fact {i} in request body.")
+            try:
+                KnwlFact(**fact)
+            except ValidationError as e:
+                raise HTTPException(status_code=400, detail=f"Invalid fact {i} in request body: {e}")
+        job_ids = [await service.add_job("fact", fact) for fact in data]
+
+        return [JobResponse(job_id=job_id, message="Fact job started successfully") for job_id in job_ids]
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/ask", description="Ask a question.", response_model=KnwlAnswer)
 async def ask_question(request: Request):
     """
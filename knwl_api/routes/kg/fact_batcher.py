@@ -0,0 +1,137 @@
+import asyncio
+from typing import Callable, Optional
+
+from knwl.models.KnwlNode import KnwlNode
+
+from knwl_api.models.KnwlFact import KnwlFact
+from knwl_api.routes.kg.graph_index import get_topology
+
+
+class FactBatcher:
+    """
+    Coalesces fact additions into bulk graph writes (group commit).
+    A flusher task owned by the running loop waits until `max_size` facts are pending or `max_delay` seconds have passed
+    since the first one, and then writes them in one go. The facts arriving while a batch is being written form the next batch.
+    A `max_delay` of 0 writes every fact right away unless a write is already in progress. Every caller awaits its own node,
+    all of them resolve (or fail) when their batch commits.
+    The optional `on_write` callback receives the node Ids written to the graph, also when the embedding fails afterwards.
+    """
+
+    def __init__(self, knwl, max_size: int = 100, max_delay: float = 0.05, on_write: Optional[Callable[[list[str]], None]] = None):
+        self.knwl = knwl
+        self.on_write = on_write
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self.pending: list[tuple[KnwlNode, asyncio.Future]] = []
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.wakeup: Optional[asyncio.Event] = None
+        self.full: Optional[asyncio.Event] = None
+        self.flusher: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """
+        Starts the flusher on the running loop, this happens in the app lifespan or otherwise on the first addition.
+        A flusher left behind by a loop which is gone is replaced.
+        """
+        loop = asyncio.get_running_loop()
+        if self.loop is loop and self.flusher is not None and not self.flusher.done():
+            return
+        if self.loop is not loop:
+            # the callers waiting on a loop which is gone can no longer be resolved
+            self.pending = []
+        self.loop = loop
+        self.wakeup = asyncio.Event()
+        self.full = asyncio.Event()
+        self.flusher = asyncio.create_task(self.run())
+        if self.pending:
+            self.wakeup.set()
+
+    async def add(self, fact: KnwlFact) -> KnwlNode:
+        """Adds the fact to the next batch and returns the stored node once the batch is committed."""
+        self.start()
+        node = KnwlNode(id=fact.id, name=fact.name, description=fact.content, type=fact.type)
+        future = self.loop.create_future()
+        self.pending.append((node, future))
+        self.wakeup.set()
+        if len(self.pending) >= self.max_size:
+            self.full.set()
+        return await future
+
+    async def run(self) -> None:
+        while True:
+            await self.wakeup.wait()
+            if self.max_delay > 0 and len(self.pending) < self.max_size:
+                # linger so that more facts can join, a full batch is taken right away
+                try:
+                    await asyncio.wait_for(self.full.wait(), self.max_delay)
+                except asyncio.TimeoutError:
+                    pass
+            batch, self.pending = self.pending[: self.max_size], self.pending[self.max_size :]
+            if len(self.pending) < self.max_size:
+                self.full.clear()
+            if not self.pending:
+                self.wakeup.clear()
+            if batch:
+                await self.commit(batch)
+
+    async def commit(self, batch: list[tuple[KnwlNode, asyncio.Future]]) -> None:
+        try:
+            nodes = await self.combine([node for node, _ in batch])
+            stored = {node.id: node for node in await self.write(nodes)}
+            for node, future in batch:
+                if not future.done():
+                    future.set_result(stored.get(node.id, node))
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+    async def combine(self, nodes: list[KnwlNode]) -> list[KnwlNode]:
+        """
+        Combines the facts of a batch sharing a node Id (same name and type) into one node,
+        their descriptions are summarized together like those of consecutive `add_fact` calls.
+        """
+        groups: dict[str, list[KnwlNode]] = {}
+        for node in nodes:
+            groups.setdefault(node.id, []).append(node)
+        combined = []
+        for group in groups.values():
+            node = group[-1]
+            descriptions = list(dict.fromkeys(n.description for n in group if n.description))
+            if len(descriptions) > 1:
+                summary = await self.knwl.grag.semantic_graph.summarization.summarize(descriptions)
+                if summary is not None and len(summary.strip()) > 0:
+                    node = node.model_copy(update={"description": summary.strip()})
+            combined.append(node)
+        return combined
+
+    async def write(self, nodes: list[KnwlNode]) -> list[KnwlNode]:
+        """
+        Same as `embed_nodes` of the semantic graph, but the nodes are written with a single save of the graph
+        and a single upsert of the embeddings instead of one of each per node.
+        """
+        semantic_graph = self.knwl.grag.semantic_graph
+        storage = semantic_graph.graph
+        data = {}
+        for node in nodes:
+            node = await semantic_graph.merge_node_descriptions(node)
+            data[node.id] = node.model_dump(mode="json")
+        try:
+            topology = get_topology(storage)
+        except NotImplementedError:
+            topology = None
+        try:
+            if topology is None:
+                await storage.merge([dict(payload) for payload in data.values()], [])
+            else:
+                # the merge of the storage saves the graph after every node, add them to the topology and save once
+                for node_id, payload in data.items():
+                    payload = dict(payload)
+                    storage.validate_payload(payload)
+                    topology.add_node(node_id, **payload)
+                await storage.save()
+        finally:
+            if self.on_write is not None:
+                self.on_write(list(data))
+        await semantic_graph.node_embeddings.upsert(data)
+        return [KnwlNode(**payload) for payload in data.values()]
@@ -0,0 +1,166 @@
+import base64
+import json
+from bisect import bisect_left, bisect_right, insort
+from typing import Optional
+
+# A key is the (case-folded name, id) pair the listings are sorted on.
+IndexKey = tuple[str, str]
+
+
+def get_topology(storage):
+    """Returns the in-memory topology (a NetworkX multi-digraph) behind the given graph storage."""
+    topology = getattr(storage, "graph", None)
+    if topology is None or not hasattr(topology, "edges"):
+        raise NotImplementedError(f"Graph storage '{type(storage).__name__}' does not expose its topology.")
+    return topology
+
+
+class GraphIndex:
+    """
+    Sorted in-memory indexes over the graph topology, used for cursor pagination of nodes and edges.
+    Nodes are ordered by (name, id) and edges by (source name, id), so a name prefix is a contiguous range
+    and resuming from a cursor is a single bisect instead of a scan over the preceding pages.
+    The index is built on the first query and then kept up to date via `touch` with the nodes a write affected.
+    """
+
+    def __init__(self):
+        self._topology = None
+        self._nodes: list[IndexKey] = []
+        self._nodes_by_type: dict[str, list[IndexKey]] = {}
+        self._edges: list[IndexKey] = []
+        self._edges_by_type: dict[str, list[IndexKey]] = {}
+        # id -> (key, type) of the indexed nodes
+        self._node_entries: dict[str, tuple[IndexKey, str]] = {}
+        # id -> (key, type, source id, target id, storage key) of the indexed edges
+        self._edge_entries: dict[str, tuple[IndexKey, str, str, str, str]] = {}
+        # node id -> ids of the indexed edges attached to it
+        self._node_edges: dict[str, set[str]] = {}
+
+    def ensure(self, storage) -> None:
+        """Builds the index from the given graph storage on first use."""
+        if self._topology is not None:
+            return
+        topology = get_topology(storage)
+        self._topology = topology
+        for node_id, data in topology.nodes(data=True):
+            self._add_node(node_id, data, sort=False)
+        for source_id, target_id, edge_key, data in topology.edges(keys=True, data=True):
+            self._add_edge(source_id, target_id, edge_key, data, sort=False)
+        for keys in [self._nodes, self._edges, *self._nodes_by_type.values(), *self._edges_by_type.values()]:
+            keys.sort()
+
+    def touch(self, node_ids: list[str]) -> None:
+        """
+        Re-indexes the given nodes and the edges attached to them after they were added, updated or deleted.
+        This costs a bisect and an insert per node/edge instead of a rebuild of the whole index.
+        """
+        topology = self._topology
+        if topology is None:
+            return
+        for node_id in node_ids:
+            self._remove_node(node_id)
+            for edge_id in list(self._node_edges.get(node_id, ())):
+                self._remove_edge(edge_id)
+            if node_id in topology:
+                self._add_node(node_id, topology.nodes[node_id])
+                for source_id, target_id, edge_key, data in topology.out_edges(node_id, keys=True, data=True):
+                    self._add_edge(source_id, target_id, edge_key, data)
+                for source_id, target_id, edge_key, data in topology.in_edges(node_id, keys=True, data=True):
+                    self._add_edge(source_id, target_id, edge_key, data)
+
+    def _add_node(self, node_id: str, data: dict, sort: bool = True) -> None:
+        key = (str(data.get("name", "")).casefold(), node_id)
+        type = data.get("type", "Unknown")
+        self._node_entries[node_id] = (key, type)
+        GraphIndex._insert(self._nodes, key, sort)
+        GraphIndex._insert(self._nodes_by_type.setdefault(type, []), key, sort)
+
+    def _remove_node(self, node_id: str) -> None:
+        found = self._node_entries.pop(node_id, None)
+        if found is not None:
+            key, type = found
+            GraphIndex._delete(self._nodes, key)
+            GraphIndex._delete(self._nodes_by_type.get(type, []), key)
+
+    def _add_edge(self, source_id: str, target_id: str, edge_key: str, data: dict, sort: bool = True) -> None:
+        edge_id = data.get("id")
+        if edge_id is None:
+            return
+        self._remove_edge(edge_id)
+        source_name = self._topology.nodes[source_id].get("name", "")
+        key = (str(source_name).casefold(), edge_id)
+        type = data.get("type", "Unknown")
+        self._edge_entries[edge_id] = (key, type, source_id, target_id, edge_key)
+        self._node_edges.setdefault(source_id, set()).add(edge_id)
+        self._node_edges.setdefault(target_id, set()).add(edge_id)
+        GraphIndex._insert(self._edges, key, sort)
+        GraphIndex._insert(self._edges_by_type.setdefault(type, []), key, sort)
+
+    def _remove_edge(self, edge_id: str) -> None:
+        found = self._edge_entries.pop(edge_id, None)
+        if found is not None:
+            key, type, source_id, target_id, _ = found
+            GraphIndex._delete(self._edges, key)
+            GraphIndex._delete(self._edges_by_type.get(type, []), key)
+            self._node_edges.get(source_id, set()).discard(edge_id)
+            self._node_edges.get(target_id, set()).discard(edge_id)
+
+    @staticmethod
+    def _insert(keys: list[IndexKey], key: IndexKey, sort: bool) -> None:
+        if sort:
+            insort(keys, key)
+        else:
+            keys.append(key)
+
+    @staticmethod
+    def _delete(keys: list[IndexKey], key: IndexKey) -> None:
+        i = bisect_left(keys, key)
+        if i < len(keys) and keys[i] == key:
+            del keys[i]
+
+    def page_nodes(self, type: Optional[str], name_prefix: Optional[str], cursor: Optional[str], limit: int) -> tuple[list[str], Optional[str]]:
+        """Returns a page of node Ids and the cursor of the next page, if any."""
+        keys = self._nodes if type is None else self._nodes_by_type.get(type, [])
+        return GraphIndex._page(keys, name_prefix, cursor, limit)
+
+    def page_edges(self, type: Optional[str], name_prefix: Optional[str], cursor: Optional[str], limit: int) -> tuple[list[str], Optional[str]]:
+        """Returns a page of edge Ids and the cursor of the next page, if any."""
+        keys = self._edges if type is None else self._edges_by_type.get(type, [])
+        return GraphIndex._page(keys, name_prefix, cursor, limit)
+
+    def get_edge(self, edge_id: str) -> dict | None:
+        """Returns the edge data without scanning the edge list of the storage."""
+        found = self._edge_entries.get(edge_id)
+        if found is None or self._topology is None:
+            return None
+        _, _, source_id, target_id, edge_key = found
+        data = self._topology.get_edge_data(source_id, target_id, key=edge_key)
+        if data is None:
+            return None
+        return {**data, "source_id": source_id, "target_id": target_id}
+
+    @staticmethod
+    def _page(keys: list[IndexKey], name_prefix: Optional[str], cursor: Optional[str], limit: int) -> tuple[list[str], Optional[str]]:
+        prefix = (name_prefix or "").casefold()
+        start = bisect_left(keys, (prefix, ""))
+        if cursor:
+            start = max(start, bisect_right(keys, GraphIndex.decode_cursor(cursor)))
+        # one extra key tells whether there is a next page
+        window = keys[start:start + limit + 1]
+        if prefix:
+            window = [key for key in window if key[0].startswith(prefix)]
+        page = window[:limit]
+        next_cursor = GraphIndex.encode_cursor(page[-1]) if len(window) > limit else None
+        return [key[1] for key in page], next_cursor
+
+    @staticmethod
+    def encode_cursor(key: IndexKey) -> str:
+        return base64.urlsafe_b64encode(json.dumps(list(key)).encode("utf-8")).decode("ascii")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> IndexKey:
+        try:
+            name, id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+            return str(name), str(id)
+        except Exception:
+            raise ValueError(f"Invalid cursor '{cursor}'.")
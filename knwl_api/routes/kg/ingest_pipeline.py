@@ -0,0 +1,176 @@
+import asyncio
+import time
+import weakref
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Optional
+
+from knwl import KnwlInput
+from knwl.models.KnwlChunk import KnwlChunk
+from knwl.models.KnwlDocument import KnwlDocument
+from knwl.models.KnwlGraph import KnwlGraph
+
+# Stages in processing order with their default amount of workers.
+# Extraction is LLM-bound and benefits most from parallelism, the amount of extract workers also caps the concurrent LLM calls.
+DEFAULT_WORKERS = {"chunk": 1, "extract": 4, "upsert": 1, "embed": 1}
+
+
+@dataclass
+class IngestItem:
+    input: KnwlInput
+    future: asyncio.Future
+    document: Optional[KnwlDocument] = None
+    chunks: list[KnwlChunk] = field(default_factory=list)
+    graph: Optional[KnwlGraph] = None
+    stats: dict[str, dict] = field(default_factory=dict)
+
+
+class IngestPipeline:
+    """
+    Splits the ingestion of `GraphRAG.ingest` into stages (chunk, extract, upsert, embed) connected by bounded queues.
+    Every stage has its own workers, so the graph writes of one document overlap with the extraction of the next.
+    The upsert and embed stages both write the graph, they lock the nodes of a document so writes to the same node never interleave.
+    The result of an ingestion is the extracted graph together with the items processed and the time spent per stage.
+    The optional `on_write` callback receives the node Ids written to the graph, also when a later stage fails.
+    """
+
+    def __init__(self, knwl, workers: Optional[dict[str, int]] = None, queue_size: int = 16, on_write: Optional[Callable[[list[str]], None]] = None):
+        self.knwl = knwl
+        self.on_write = on_write
+        self.workers = {**DEFAULT_WORKERS, **(workers or {})}
+        self.queue_size = queue_size
+        self.stages: list[tuple[str, Callable[[IngestItem], Awaitable[int]]]] = [
+            ("chunk", self.chunk),
+            ("extract", self.extract),
+            ("upsert", self.upsert),
+            ("embed", self.embed),
+        ]
+        self.queues: dict[str, asyncio.Queue] = {}
+        self.tasks: list[asyncio.Task] = []
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.extractions: Optional[asyncio.Semaphore] = None
+        self.node_locks: weakref.WeakValueDictionary[str, asyncio.Lock] = weakref.WeakValueDictionary()
+
+    @property
+    def grag(self):
+        return self.knwl.grag
+
+    def start(self) -> None:
+        """
+        Starts the stage workers on the running loop, this happens in the app lifespan or otherwise on the first ingestion.
+        Workers left behind by a loop which is gone are replaced.
+        """
+        loop = asyncio.get_running_loop()
+        if self.loop is loop and self.tasks:
+            return
+        self.loop = loop
+        self.tasks = []
+        self.queues = {name: asyncio.Queue(maxsize=self.queue_size) for name, _ in self.stages}
+        self.extractions = asyncio.Semaphore(max(1, self.workers["extract"]))
+        self.node_locks = weakref.WeakValueDictionary()
+        for index, (name, handler) in enumerate(self.stages):
+            next_stage = self.stages[index + 1][0] if index + 1 < len(self.stages) else None
+            for _ in range(max(1, self.workers[name])):
+                self.tasks.append(asyncio.create_task(self.work(name, handler, next_stage)))
+
+    async def ingest(self, input: KnwlInput) -> dict[str, Any]:
+        """Ingests the input through the pipeline and returns the graph dump with the per-stage statistics."""
+        self.start()
+        item = IngestItem(input=input, future=asyncio.get_running_loop().create_future())
+        await self.queues[self.stages[0][0]].put(item)
+        return await item.future
+
+    async def work(self, name: str, handler: Callable[[IngestItem], Awaitable[int]], next_stage: Optional[str]) -> None:
+        queue = self.queues[name]
+        while True:
+            item: IngestItem = await queue.get()
+            try:
+                if item.future.done():
+                    continue
+                started = time.perf_counter()
+                count = await handler(item)
+                seconds = time.perf_counter() - started
+                item.stats[name] = {"items": count, "seconds": round(seconds, 4), "items_per_second": round(count / seconds, 2) if seconds > 0 else None}
+                if next_stage is not None:
+                    await self.queues[next_stage].put(item)
+                else:
+                    result = item.graph.model_dump(mode="dict")
+                    result["stages"] = item.stats
+                    item.future.set_result(result)
+            except Exception as e:
+                if not item.future.done():
+                    item.future.set_exception(e)
+            finally:
+                queue.task_done()
+
+    # ============================================================================================
+    # Stages, each returns the amount of items it processed
+    # ============================================================================================
+    async def chunk(self, item: IngestItem) -> int:
+        item.document = KnwlDocument.from_input(item.input)
+        item.chunks = await self.grag.chunk(item.document)
+        return len(item.chunks)
+
+    async def extract(self, item: IngestItem) -> int:
+        # the chunks of a document are extracted concurrently within the pipeline-wide cap, the merge follows the chunk order
+        chunk_graphs = await asyncio.gather(*[self.extract_chunk(chunk) for chunk in item.chunks])
+        extracted: Optional[KnwlGraph] = None
+        for chunk_graph in chunk_graphs:
+            if chunk_graph is None:
+                continue
+            extracted = chunk_graph if extracted is None else await self.grag.semantic_graph.consolidate_graphs(extracted, chunk_graph)
+        if extracted is None:
+            raise ValueError("No knowledge graph was extracted from the input.")
+        # same cleanup as GraphRAG.extract: no self-loops, unique chunk Ids and unique (source, target, type) edges
+        for node in extracted.nodes:
+            node.chunk_ids = list(set(node.chunk_ids))
+        unique_edges = {}
+        for edge in extracted.edges:
+            if edge.source_id != edge.target_id:
+                unique_edges.setdefault((edge.source_id, edge.target_id, edge.type), edge)
+        for edge in unique_edges.values():
+            edge.chunk_ids = list(set(edge.chunk_ids))
+        item.graph = KnwlGraph(nodes=extracted.nodes, edges=list(unique_edges.values()), keywords=extracted.keywords)
+        return len(item.chunks)
+
+    async def extract_chunk(self, chunk: KnwlChunk) -> Optional[KnwlGraph]:
+        async with self.extractions:
+            return await self.grag.graph_extractor.extract_graph(chunk.content, chunk_id=chunk.id)
+
+    async def upsert(self, item: IngestItem) -> int:
+        if self.grag.ragger:
+            await self.grag.ragger.upsert_document(item.document)
+        node_dicts = [n.model_dump() for n in item.graph.nodes]
+        edge_dicts = [e.model_dump() for e in item.graph.edges]
+        node_ids = item.graph.get_node_ids()
+        async with self.lock_nodes(node_ids):
+            try:
+                await self.grag.semantic_graph.graph.merge(node_dicts, edge_dicts)
+            finally:
+                # the merge writes node by node, report whatever it got to
+                if self.on_write is not None:
+                    self.on_write(node_ids)
+        return len(node_dicts) + len(edge_dicts)
+
+    async def embed(self, item: IngestItem) -> int:
+        async with self.lock_nodes(item.graph.get_node_ids()):
+            await self.grag.semantic_graph.embed_nodes(item.graph.nodes)
+            await self.grag.semantic_graph.embed_edges(item.graph.edges)
+        return len(item.graph.nodes) + len(item.graph.edges)
+
+    @asynccontextmanager
+    async def lock_nodes(self, node_ids: list[str]):
+        """Locks the given nodes, always in the same order so that two documents sharing nodes cannot deadlock."""
+        locks = []
+        for node_id in sorted(set(node_ids)):
+            lock = self.node_locks.get(node_id)
+            if lock is None:
+                lock = self.node_locks[node_id] = asyncio.Lock()
+            locks.append(lock)
+        for lock in locks:
+            await lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in reversed(locks):
+                lock.release()
@@ -1,22 +1,50 @@
 import asyncio
 import time
-from typing import Dict
+from typing import AsyncIterator, Dict, Optional
+from uuid import uuid4
 
 from knwl import Knwl, KnwlInput, KnwlParams, KnwlAnswer, KnwlContext
+from knwl.models.KnwlEdge import KnwlEdge
+from knwl.models.KnwlNode import KnwlNode
 
+from knwl_api.models.JobRecord import JobRecord
 from knwl_api.models.JobStatus import JobStatus, JobState
 from knwl_api.models.KnwlFact import KnwlFact
+from knwl_api.models.KnwlNeighborhood import KnwlNeighborhood
+from knwl_api.routes.kg.fact_batcher import FactBatcher
+from knwl_api.routes.kg.graph_index import GraphIndex, get_topology
+from knwl_api.routes.kg.ingest_pipeline import IngestPipeline
+from knwl_api.routes.kg.traversal import bfs_neighborhood
 
 knwl = Knwl()  # Initialize Knwl instance with default namespace
 
 # In-memory job storage (in production, use Redis or a database)
-jobs: Dict[str, JobStatus] = {}
+jobs: Dict[str, JobRecord] = {}
+
+# Sorted indexes for the node/edge listings, updated with the nodes touched by the writes going through this service
+graph_index = GraphIndex()
+
+# Staged ingestion (chunk, extract, upsert, embed) shared by all ingest jobs
+ingest_pipeline = IngestPipeline(knwl, on_write=graph_index.touch)
+
+# Facts arriving within a short window (50ms) are written to the graph in one go
+fact_batcher = FactBatcher(knwl, on_write=graph_index.touch)
+
+MAX_PAGE_SIZE = 1000
+MAX_NEIGHBORHOOD_DEPTH = 3
+MAX_NEIGHBORHOOD_SIZE = 500
+
+
+async def start_workers():
+    """Starts the background workers on the loop of the app, called from the app lifespan"""
+    ingest_pipeline.start()
+    fact_batcher.start()
 
 
 async def add_job(job_type: str, data: dict) -> str:
     """Adds a new ingestion job to the job queue"""
-    job_id = str(time.time())  # Simple job ID generation using timestamp
-    jobs[job_id] = JobStatus(job_type=job_type, job_id=job_id, state=JobState.PENDING, created_at=time.time(), updated_at=time.time(), )
+    job_id = str(uuid4())  # timestamps collide when jobs are added in bulk
+    jobs[job_id] = JobRecord(job_type=job_type, job_id=job_id, state=JobState.PENDING, created_at=time.time(), updated_at=time.time(), )
     if job_type == "ingest":
         input = KnwlInput(**data)
         asyncio.create_task(process_ingest_job(job_id, input))
@@ -27,7 +55,13 @@ async def add_job(job_type: str, data: dict) -> str:
 
 
 async def get_job_status(job_id: str) -> JobStatus | None:
-    """Retrieves the status of a given job"""
+    """Retrieves the status of a given job, large results are summarized"""
+    record = jobs.get(job_id)
+    return record.to_status() if record is not None else None
+
+
+async def get_job(job_id: str) -> JobRecord | None:
+    """Retrieves the record of a given job, use `get_result` on it for the full result"""
     return jobs.get(job_id)
 
 
@@ -38,12 +72,12 @@ async def process_ingest_job(job_id: str, input: KnwlInput):
         jobs[job_id].state = JobState.RUNNING
         jobs[job_id].updated_at = time.time()
 
-        # Perform the actual ingestion
-        result = await knwl.ingest(input)
+        # Perform the actual ingestion, the result includes the throughput per stage
+        result = await ingest_pipeline.ingest(input)
 
         # Update job state to completed
         jobs[job_id].state = JobState.COMPLETED
-        jobs[job_id].result = result.model_dump(mode="dict")
+        jobs[job_id].set_result(result)
         jobs[job_id].updated_at = time.time()
     except Exception as e:
         # Update job state to failed
@@ -59,12 +93,12 @@ async def process_fact_job(job_id: str, fact: KnwlFact):
         jobs[job_id].state = JobState.RUNNING
         jobs[job_id].updated_at = time.time()
 
-        # Perform the actual fact addition
-        result = await knwl.add_fact(name=fact.name, content=fact.content, type=fact.type, id=fact.id)
+        # Perform the actual fact addition, batched with the other facts pending in the same window
+        result = await fact_batcher.add(fact)
 
         # Update job state to completed
         jobs[job_id].state = JobState.COMPLETED
-        jobs[job_id].result = result.model_dump(mode="dict")
+        jobs[job_id].set_result(result.model_dump(mode="dict"))
         jobs[job_id].updated_at = time.time()
     except Exception as e:
         # Update job state to failed
@@ -95,7 +129,60 @@ async def get_node_by_id(id: str):
 
 async def delete_node_by_id(id: str):
     """Deletes a node by its Id."""
-    return await knwl.delete_node_by_id(id)
+    deleted = await knwl.delete_node_by_id(id)
+    graph_index.touch([id])
+    return deleted
+
+
+async def list_node_ids(type: Optional[str] = None, name_prefix: Optional[str] = None, cursor: Optional[str] = None, limit: int = 100) -> tuple[list[str], Optional[str]]:
+    """
+    Returns a page of node Ids, optionally filtered by type and name prefix, together with the cursor of the next page.
+    Raises a ValueError if the cursor is invalid.
+    """
+    graph_index.ensure(knwl.grag.semantic_graph.graph)
+    return graph_index.page_nodes(type, name_prefix, cursor, max(1, min(limit, MAX_PAGE_SIZE)))
+
+
+async def list_edge_ids(type: Optional[str] = None, name_prefix: Optional[str] = None, cursor: Optional[str] = None, limit: int = 100) -> tuple[list[str], Optional[str]]:
+    """
+    Returns a page of edge Ids, optionally filtered by type and the name prefix of the source node, together with the cursor of the next page.
+    Raises a ValueError if the cursor is invalid.
+    """
+    graph_index.ensure(knwl.grag.semantic_graph.graph)
+    return graph_index.page_edges(type, name_prefix, cursor, max(1, min(limit, MAX_PAGE_SIZE)))
+
+
+async def iter_nodes(ids: list[str]) -> AsyncIterator[KnwlNode]:
+    """Yields the nodes with the given Ids, skipping the ones deleted in the meantime."""
+    for id in ids:
+        node = await knwl.get_node_by_id(id)
+        if node is not None:
+            yield node
+
+
+async def iter_edges(ids: list[str]) -> AsyncIterator[KnwlEdge]:
+    """Yields the edges with the given Ids, skipping the ones deleted in the meantime."""
+    for id in ids:
+        data = graph_index.get_edge(id)
+        if data is not None:
+            yield KnwlEdge(**knwl.grag.semantic_graph.fix_lists_in_data(dict(data)))
+
+
+async def get_neighborhood(id: str, depth: int = 1, limit: int = 50, fan_out: int = 25, edge_limit: Optional[int] = None) -> KnwlNeighborhood | None:
+    """
+    Returns the subgraph within `depth` hops of the given node, or None if the node does not exist.
+    The breadth-first traversal expands at most `fan_out` new neighbors per node and stops once `limit` nodes or `edge_limit` edges (by default four times the node limit) are collected.
+    """
+    depth = max(0, min(depth, MAX_NEIGHBORHOOD_DEPTH))
+    limit = max(1, min(limit, MAX_NEIGHBORHOOD_SIZE))
+    edge_limit = max(0, min(edge_limit if edge_limit is not None else 4 * limit, 4 * MAX_NEIGHBORHOOD_SIZE))
+    found = bfs_neighborhood(get_topology(knwl.grag.semantic_graph.graph), id, depth, limit, edge_limit, max(1, fan_out))
+    if found is None:
+        return None
+    node_ids, edge_dicts, truncated = found
+    nodes = [node async for node in iter_nodes(node_ids)]
+    edges = [KnwlEdge(**knwl.grag.semantic_graph.fix_lists_in_data(e)) for e in edge_dicts]
+    return KnwlNeighborhood(root_id=id, depth=depth, nodes=nodes, edges=edges, truncated=truncated)
 
 
 async def ask_question(question: str, strategy: str = None) -> KnwlAnswer:
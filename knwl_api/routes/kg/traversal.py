@@ -0,0 +1,60 @@
+from itertools import chain
+
+
+def bfs_neighborhood(topology, root_id: str, depth: int, node_limit: int, edge_limit: int, fan_out: int) -> tuple[list[str], list[dict], bool] | None:
+    """
+    Breadth-first traversal of the topology around the given node, ignoring edge direction.
+
+    - per node at most `fan_out` new neighbors are expanded into the next level
+    - nodes and edges are visited once
+    - the edges between the nodes of the outermost level are collected after the traversal
+    - the traversal stops as soon as the node or edge budget is spent
+
+    Returns the visited node Ids (root first), the edge data and whether the result was truncated,
+    or None if the root does not exist.
+    """
+    if root_id not in topology:
+        return None
+    visited = {root_id: None}  # insertion ordered set
+    edges: dict[str, dict] = {}
+    truncated = False
+    frontier = [root_id]
+    for _ in range(depth):
+        next_frontier = []
+        for node_id in frontier:
+            expanded = 0
+            for source_id, target_id, key, data in incident_edges(topology, node_id):
+                edge_id = data.get("id") or f"({source_id},{target_id},{key})"
+                if edge_id in edges:
+                    continue
+                other_id = target_id if source_id == node_id else source_id
+                if other_id not in visited:
+                    if expanded >= fan_out:
+                        # capped, the edges to nodes already visited are still collected
+                        truncated = True
+                        continue
+                    if len(visited) >= node_limit:
+                        return list(visited), list(edges.values()), True
+                    visited[other_id] = None
+                    next_frontier.append(other_id)
+                    expanded += 1
+                if len(edges) >= edge_limit:
+                    return list(visited), list(edges.values()), True
+                edges[edge_id] = {**data, "source_id": source_id, "target_id": target_id}
+        frontier = next_frontier
+        if not frontier:
+            break
+    # the outermost level was not expanded, add the edges among its nodes and to the rest of the neighborhood
+    for node_id in frontier if depth > 0 else []:
+        for source_id, target_id, key, data in incident_edges(topology, node_id):
+            edge_id = data.get("id") or f"({source_id},{target_id},{key})"
+            if edge_id in edges or source_id not in visited or target_id not in visited:
+                continue
+            if len(edges) >= edge_limit:
+                return list(visited), list(edges.values()), True
+            edges[edge_id] = {**data, "source_id": source_id, "target_id": target_id}
+    return list(visited), list(edges.values()), truncated
+
+
+def incident_edges(topology, node_id: str):
+    return chain(topology.out_edges(node_id, keys=True, data=True), topology.in_edges(node_id, keys=True, data=True))
@@ -16,8 +16,9 @@ def app():
 
 @pytest.fixture(autouse=True, scope="module")
 def client(app):
-    client = TestClient(app)
-    return client
+    # entering the client keeps a single event loop for the module, so the background jobs outlive the request adding them
+    with TestClient(app) as client:
+        yield client
 
 
 @pytest.fixture(autouse=True, scope="module")
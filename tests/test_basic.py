@@ -45,6 +45,8 @@ async def test_facts(client):
 
     job_status_response = client.get(f"/kg/job/abcdefg12345")
     assert job_status_response.status_code == 404  # job not found
+    job_result_response = client.get(f"/kg/job/abcdefg12345/result")
+    assert job_result_response.status_code == 404
 
 
 @pytest.mark.asyncio
@@ -70,10 +72,17 @@ async def test_ingest(client):
     else:
         pytest.fail("Ingest job did not complete in expected time.")
 
-    # Check the result
+    # Check the result, the job status only holds a summary of the graph
     assert "result" in job_status
-    result = job_status["result"]
-    assert "id" in result
+    summary = job_status["result"]
+    assert "id" in summary
+    assert list(summary["stages"].keys()) == ["chunk", "extract", "upsert", "embed"]
+    response = client.get(f"/kg/job/{job_id}/result")
+    assert response.status_code == 200
+    result = response.json()
+    assert result["id"] == summary["id"]
+    assert len(result["nodes"]) == summary["node_count"]
+    assert [e["id"] for e in result["edges"]] == summary["edge_ids"]
     print(f"\n\nINGEST RESULT: {len(result['nodes'])} nodes and {len(result["edges"])} edges ingested.")
     print(json.dumps(result, indent=2))
 
@@ -102,3 +111,196 @@ async def test_augment(client):
     # assert "Ernst Mach" in answer["answer"]
     print(f"\n\nAUGMENTATION")
     print(json.dumps(answer, indent=2))
+
+
+@pytest.mark.asyncio
+async def test_list_nodes(client):
+    node_count = client.get("/kg/node_count").json()
+    ids = []
+    cursor = None
+    while True:
+        params = {"limit": 10}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/kg/nodes", params=params)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        ids.extend([json.loads(line)["id"] for line in response.text.splitlines()])
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+    assert len(ids) == node_count
+    assert len(set(ids)) == node_count
+
+    response = client.get("/kg/edges", params={"limit": 5})
+    assert response.status_code == 200
+    assert len(response.text.splitlines()) <= 5
+
+    response = client.get("/kg/nodes", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_neighborhood(client):
+    response = client.get(f"/kg/node/{uuid4()}/neighborhood")
+    assert response.status_code == 404
+
+    response = client.get("/kg/nodes", params={"limit": 1})
+    lines = response.text.splitlines()
+    if len(lines) == 0:
+        pytest.skip("The graph is empty.")
+    root_id = json.loads(lines[0])["id"]
+    response = client.get(f"/kg/node/{root_id}/neighborhood", params={"depth": 2, "limit": 10})
+    assert response.status_code == 200
+    neighborhood = response.json()
+    assert neighborhood["root_id"] == root_id
+    assert neighborhood["nodes"][0]["id"] == root_id
+    assert len(neighborhood["nodes"]) <= 10
+    node_ids = [n["id"] for n in neighborhood["nodes"]]
+    for edge in neighborhood["edges"]:
+        assert edge["source_id"] in node_ids and edge["target_id"] in node_ids
+
+
+@pytest.mark.asyncio
+async def test_admission(client):
+    from knwl_api.admission import AdaptiveLimit, LimitSettings
+
+    assert client.get("/kg/namespace").status_code == 200
+    stats = client.get("/kg/admission").json()
+    assert "/kg/namespace" in stats
+    assert stats["/kg/namespace"]["limit"] >= 1
+    assert "/kg/admission" not in stats
+
+    limit = AdaptiveLimit(LimitSettings(initial=2, target_latency=1.0))
+    first, second = limit.try_acquire(), limit.try_acquire()
+    assert first and second
+    assert limit.try_acquire() is None
+    assert limit.rejected == 1
+    limit.release(first, 5.0)  # too slow, the limit backs off
+    assert limit.limit == 1.5
+    limit.release(second, 5.0)  # admitted before the cut, same congestion window
+    assert limit.limit == 1.5
+    third = limit.try_acquire()
+    assert limit.try_acquire() is None
+    limit.release(third, 0.1)  # fast and busy, the limit grows again
+    assert limit.limit > 1.5
+
+
+@pytest.mark.asyncio
+async def test_bulk_facts(client):
+    facts = [{"name": f"Bulk Fact {i}", "content": f"This is bulk fact {i}.", "type": "test_type", "id": str(uuid4())} for i in range(3)]
+    response = client.post("/kg/facts", json=facts)
+    assert response.status_code == 200
+    job_ids = [job["job_id"] for job in response.json()]
+    assert len(set(job_ids)) == len(facts)
+    # Poll for job completion, the facts are committed together
+    import time
+    for _ in range(20):
+        states = [client.get(f"/kg/job/{job_id}").json()["state"] for job_id in job_ids]
+        if "failed" in states:
+            pytest.fail("Bulk fact job failed.")
+        if all(state == "completed" for state in states):
+            break
+        time.sleep(1)
+    else:
+        pytest.fail("Bulk fact jobs did not complete in expected time.")
+
+    for fact in facts:
+        response = client.get(f"/kg/node/{fact['id']}")
+        assert response.status_code == 200
+        assert response.json()["name"] == fact["name"]
+        client.delete(f"/kg/node/{fact['id']}")
+
+    response = client.post("/kg/facts", json=[{"name": "No content"}])
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_listing_after_failed_embedding(client, monkeypatch):
+    from knwl_api.routes.kg import service
+
+    client.get("/kg/nodes", params={"limit": 1})  # builds the listing index
+
+    async def failing_upsert(data):
+        raise RuntimeError("Embedding service unavailable.")
+
+    monkeypatch.setattr(service.knwl.grag.semantic_graph.node_embeddings, "upsert", failing_upsert)
+    fact_data = {"name": f"Unembedded Fact {uuid4()}", "content": "This fact is never embedded.", "type": "test_type", "id": str(uuid4())}
+    job_id = client.post("/kg/fact", json=fact_data).json()["job_id"]
+    import time
+    for _ in range(20):
+        job_status = client.get(f"/kg/job/{job_id}").json()
+        if job_status["state"] not in ("pending", "running"):
+            break
+        time.sleep(0.5)
+    assert job_status["state"] == "failed"
+
+    # the node made it into the graph before the embedding failed, so it is listed
+    response = client.get("/kg/nodes", params={"name_prefix": fact_data["name"]})
+    assert [json.loads(line)["id"] for line in response.text.splitlines()] == [fact_data["id"]]
+    client.delete(f"/kg/node/{fact_data['id']}")
+
+
+@pytest.mark.asyncio
+async def test_duplicate_facts(client, monkeypatch):
+    from knwl_api.routes.kg import service
+
+    async def summarize(descriptions):
+        return " ".join(descriptions)
+
+    monkeypatch.setattr(service.knwl.grag.semantic_graph.summarization, "summarize", summarize)
+    # same name and type, so both facts describe the same node
+    name = f"Duplicate Fact {uuid4()}"
+    facts = [{"name": name, "content": "Mach was a physicist.", "type": "test_type"}, {"name": name, "content": "Mach was a philosopher.", "type": "test_type"}]
+    response = client.post("/kg/facts", json=facts)
+    assert response.status_code == 200
+    job_ids = [job["job_id"] for job in response.json()]
+    import time
+    for _ in range(20):
+        states = [client.get(f"/kg/job/{job_id}").json()["state"] for job_id in job_ids]
+        if "failed" in states:
+            pytest.fail("Duplicate fact job failed.")
+        if all(state == "completed" for state in states):
+            break
+        time.sleep(1)
+    else:
+        pytest.fail("Duplicate fact jobs did not complete in expected time.")
+
+    node_ids = {client.get(f"/kg/job/{job_id}").json()["result"]["id"] for job_id in job_ids}
+    assert len(node_ids) == 1
+    node_id = node_ids.pop()
+    description = client.get(f"/kg/node/{node_id}").json()["description"]
+    assert "physicist" in description and "philosopher" in description
+    client.delete(f"/kg/node/{node_id}")
+
+
+@pytest.mark.asyncio
+async def test_fact_window(client, monkeypatch):
+    from knwl_api.routes.kg import service
+
+    assert service.fact_batcher.max_delay > 0
+    batches = []
+    commit = service.fact_batcher.commit
+
+    async def counting_commit(batch):
+        batches.append(len(batch))
+        await commit(batch)
+
+    monkeypatch.setattr(service.fact_batcher, "commit", counting_commit)
+    # a generous window, the posts below take far less than a second
+    monkeypatch.setattr(service.fact_batcher, "max_delay", 1.0)
+    facts = [{"name": f"Window Fact {i}", "content": f"This is window fact {i}.", "type": "test_type", "id": str(uuid4())} for i in range(3)]
+    job_ids = [client.post("/kg/fact", json=fact).json()["job_id"] for fact in facts]
+    import time
+    for _ in range(20):
+        states = [client.get(f"/kg/job/{job_id}").json()["state"] for job_id in job_ids]
+        if "failed" in states:
+            pytest.fail("Fact job failed.")
+        if all(state == "completed" for state in states):
+            break
+        time.sleep(1)
+    else:
+        pytest.fail("Fact jobs did not complete in expected time.")
+    assert batches == [len(facts)]
+    for fact in facts:
+        client.delete(f"/kg/node/{fact['id']}")